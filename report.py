@@ -21,11 +21,15 @@ Notes:
 """
 
 import datetime as dt
+import functools
+from collections import defaultdict
+import io
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 
 # =========================
@@ -60,44 +64,101 @@ TEXT_RESOURCE_EXTS = {".tres"}  # .res is often binary
 # -------------------------
 # Markdown helpers
 # -------------------------
+_TILDE_RUN_RE = re.compile(r"~+")
+
+# Indent pads for tree rendering, indexed by depth (two spaces per level).
+_PADS = tuple("  " * i for i in range(128))
+
+
+def _pad(indent: int) -> str:
+    return _PADS[indent] if indent < 128 else "  " * indent
+
+
 def choose_fence(text: str, char: str = "~") -> str:
-    runs = re.findall(rf"{re.escape(char)}+", text)
-    longest = max((len(r) for r in runs), default=0)
+    run_re = _TILDE_RUN_RE if char == "~" else re.compile(rf"{re.escape(char)}+")
+    # Track the longest run without materializing a list of every run.
+    longest = max((m.end() - m.start() for m in run_re.finditer(text)), default=0)
     return char * max(3, longest + 1)
 
 
-def fenced(text: str, lang: str = "text") -> str:
+def sorted_casefold(strings: Iterable[str]) -> List[str]:
+    items = list(strings)
+    if len(items) < 2:
+        return items
+    # Decorated tuples keep the comparisons in C instead of a lambda key.
+    decorated = [(s.casefold(), s) for s in items]
+    decorated.sort()
+    return [s for _, s in decorated]
+
+
+def sorted_rows_casefold(rows: List[Tuple[str, ...]], keys: int = 1) -> List[Tuple[str, ...]]:
+    """Sort rows by the casefolded first `keys` columns, decorate-sort-undecorate style."""
+    if len(rows) < 2:
+        return rows
+    decorated = [tuple(c.casefold() for c in r[:keys]) + (r,) for r in rows]
+    decorated.sort()
+    return [d[-1] for d in decorated]
+
+
+def write_fenced(write: Callable[[str], None], text: str, lang: str = "text") -> None:
     fence = choose_fence(text, "~")
-    return f"{fence}{lang}\n{text}\n{fence}\n"
+    write(fence)
+    write(lang)
+    write("\n")
+    write(text)
+    write("\n")
+    write(fence)
+    write("\n\n")
 
 
 # -------------------------
 # IO helpers
 # -------------------------
+# The same res://... string appears as a set member, dict key and edge target
+# many times over; deduping lets set/dict ops short-circuit on identity.
+_INTERNED: Dict[str, str] = {}
+
+
+def intern_path(s: str) -> str:
+    return _INTERNED.setdefault(s, s)
+
+
 def read_text(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        return path.read_text(encoding="utf-8", errors="replace")
+    # One read + one C-level decode; no TextIOWrapper, and no second read of
+    # the whole file when it contains invalid UTF-8. CRLF is normalized here,
+    # per file at ingestion, so nothing downstream has to scan for it.
+    return path.read_bytes().decode("utf-8", errors="replace").replace("\r\n", "\n")
 
 
+@functools.lru_cache(maxsize=65536)
 def to_res_path(project_root: Path, p: Path) -> str:
     rel = p.relative_to(project_root).as_posix()
-    return "res://" if rel == "." else f"res://{rel if rel.startswith('/') else '/' + rel}"
+    return intern_path("res://" if rel == "." else f"res://{rel if rel.startswith('/') else '/' + rel}")
 
 
+# Scenes repeat the same handful of paths many times; caching turns the
+# stat-heavy resolve into a dict hit for every repeat.
+@functools.lru_cache(maxsize=65536)
 def normalize_res_like_path(raw: str, base_dir: Path, project_root: Path) -> str:
     s = raw.strip().strip('"').strip("'")
     if not s:
         return s
     if s.startswith("uid://"):
-        return s
+        return intern_path(s)
     if s.startswith("res://"):
         tail = s[len("res://") :].lstrip("/")
-        return f"res:///{tail}" if tail else "res://"
-    abs_path = (base_dir / s).resolve()
+        return intern_path(f"res:///{tail}" if tail else "res://")
+    # Lexical normalization only; the res:// path is logical, so there is no
+    # need to hit the filesystem for the common in-project case.
+    root_str = project_root.as_posix()
+    abs_str = os.path.normpath(os.path.join(str(base_dir), s)).replace("\\", "/")
+    if abs_str == root_str:
+        return intern_path("res://")
+    if abs_str.startswith(root_str + "/"):
+        return intern_path("res:///" + abs_str[len(root_str) + 1 :])
+    # Exotic cases (symlinks, paths escaping the project root) still resolve.
     try:
-        return to_res_path(project_root, abs_path)
+        return to_res_path(project_root, (base_dir / s).resolve())
     except Exception:
         return s
 
@@ -110,12 +171,80 @@ UID_STR_RE = re.compile(r"""(['"])(uid://[^'"]+)\1""")
 
 EXTRESOURCE_ID_RE = re.compile(r'ExtResource\(\s*(?:"([^"]+)"|([^)]+))\s*\)')
 
+# Fused alternation so reference collection is one pass over the text
+# instead of separate res:// and uid:// scans. ExtResource(id) usages are
+# deliberately not scanned: callers seed their reference set with every
+# declared [ext_resource] path, which is a superset of the ids in use.
+REF_TOKEN_RE = re.compile(
+    r"""(?P<rq>['"])(?P<res>res://[^'"]+)(?P=rq)"""
+    r"""|(?P<uq>['"])(?P<uid>uid://[^'"]+)(?P=uq)"""
+)
+
+
+def collect_references(text: str, base_dir: Path, project_root: Path, refs: Set[str]) -> None:
+    """Add every res:// and uid:// string reference in text to refs."""
+    for m in REF_TOKEN_RE.finditer(text):
+        res = m.group("res")
+        if res:
+            refs.add(normalize_res_like_path(res, base_dir, project_root))
+        else:
+            refs.add(intern_path(m.group("uid")))
+
 HEADING_RE = re.compile(r"^\[(\w+)\s*(.*)\]\s*$")
 KV_RE = re.compile(r'(\w+)\s*=\s*(".*?"|\S+)')
 
 
+def _is_header_key(key: str) -> bool:
+    return bool(key) and all(ch.isalnum() or ch == "_" for ch in key)
+
+
 def parse_header_kv(header: str) -> Dict[str, str]:
     out: Dict[str, str] = {}
+    if '"' not in header and " =" not in header and "= " not in header:
+        # Fast path: bare k=v tokens (load_steps=3 format=3 ...) need no regex.
+        for tok in header.split():
+            k, sep, v = tok.partition("=")
+            if sep and k:
+                out[k] = v
+        return out
+
+    # Forward scan for quoted headers; Godot writes no escapes inside header
+    # strings, so a closing quote is just the next '"'.
+    n = len(header)
+    pos = 0
+    while pos < n:
+        while pos < n and header[pos] in " \t":
+            pos += 1
+        if pos >= n:
+            break
+        eq = header.find("=", pos)
+        if eq < 0:
+            break
+        key = header[pos:eq].strip()
+        if not _is_header_key(key):
+            break
+        vpos = eq + 1
+        while vpos < n and header[vpos] in " \t":
+            vpos += 1
+        if vpos < n and header[vpos] == '"':
+            end = header.find('"', vpos + 1)
+            if end < 0:
+                break
+            out[key] = header[vpos + 1 : end]
+            pos = end + 1
+        else:
+            end = vpos
+            while end < n and header[end] not in " \t":
+                end += 1
+            out[key] = header[vpos:end]
+            pos = end
+    else:
+        return out
+    if pos >= n:
+        return out
+
+    # Pathological header (unterminated quote, odd key); regex fallback.
+    out.clear()
     for m in KV_RE.finditer(header):
         k = m.group(1)
         v = m.group(2)
@@ -139,6 +268,19 @@ def parse_script_value(raw: str, ext_id_to_path: Dict[str, str], base_dir: Path,
     if v == "null":
         return None
 
+    # Fast path for the ~95% case, ExtResource("N"); callers pass an
+    # already-normalized id map, so the hit needs no further rewriting.
+    if v.startswith('ExtResource("'):
+        end = v.find('"', 13)
+        if end > 0:
+            rid = v[13:end]
+            if not rid:
+                return None
+            p = ext_id_to_path.get(rid)
+            if p:
+                return p
+            return f'ExtResource("{rid}")'
+
     m = EXTRESOURCE_ID_RE.search(v)
     if m:
         rid = (m.group(1) or m.group(2) or "").strip()
@@ -166,27 +308,25 @@ def parse_script_value(raw: str, ext_id_to_path: Dict[str, str], base_dir: Path,
 # -------------------------
 # project.godot parsing (INI-like, supports multi-line { ... } blocks)
 # -------------------------
+# Escaped chars are swallowed as one token, so no explicit esc state is needed.
+_BRACE_TOK_RE = re.compile(r"""\\.|["'{}]""")
+
+
 def _brace_delta_outside_quotes(s: str) -> int:
     delta = 0
     in_q: Optional[str] = None
-    esc = False
-    for ch in s:
-        if esc:
-            esc = False
-            continue
-        if ch == "\\":
-            esc = True
+    for m in _BRACE_TOK_RE.finditer(s):
+        tok = m.group()
+        if tok[0] == "\\":
             continue
         if in_q:
-            if ch == in_q:
+            if tok == in_q:
                 in_q = None
-            continue
-        if ch in ('"', "'"):
-            in_q = ch
-            continue
-        if ch == "{":
+        elif tok == '"' or tok == "'":
+            in_q = tok
+        elif tok == "{":
             delta += 1
-        elif ch == "}":
+        else:
             delta -= 1
     return delta
 
@@ -267,28 +407,25 @@ def detect_editor_references(project_root: Path) -> Set[str]:
     if not editor_dir.exists():
         return set()
 
-    candidates = [
+    # Paths hash by string, so the explicit candidates and the *.cfg glob
+    # collapse to one read per file.
+    candidates = {
         editor_dir / "project_metadata.cfg",
         editor_dir / "editor_layout.cfg",
         editor_dir / "recent_dirs",
         editor_dir / "recent_files",
-    ]
+    }
+    candidates.update(editor_dir.glob("*.cfg"))
 
     refs: Set[str] = set()
     for p in candidates:
-        if p.exists() and p.is_file():
-            try:
-                txt = read_text(p)
-            except Exception:
-                continue
-            refs |= extract_res_uid_strings(txt, p.parent, project_root)
-
-    for cfg in editor_dir.glob("*.cfg"):
         try:
-            txt = read_text(cfg)
-        except Exception:
+            txt = read_text(p)
+        except OSError:
+            # Missing candidate or not a regular file; one failed open
+            # replaces the exists()/is_file() stat pair.
             continue
-        refs |= extract_res_uid_strings(txt, cfg.parent, project_root)
+        refs |= extract_res_uid_strings(txt, editor_dir, project_root)
 
     return refs
 
@@ -296,57 +433,122 @@ def detect_editor_references(project_root: Path) -> Set[str]:
 # -------------------------
 # File collection
 # -------------------------
-def iter_project_files(project_root: Path) -> Iterable[Path]:
-    for dirpath, dirnames, filenames in os.walk(project_root):
-        dirnames[:] = [d for d in dirnames if d not in IGNORE_DIRS and not d.startswith(".")]
-        for fn in filenames:
-            if fn in IGNORE_FILES or fn.startswith("."):
-                continue
-            yield (Path(dirpath) / fn)
+def _is_ignored_dir(name: str) -> bool:
+    return name in IGNORE_DIRS or name.startswith(".")
 
 
-def collect_files(project_root: Path, exts: Set[str]) -> List[Path]:
-    out = [p for p in iter_project_files(project_root) if p.suffix.lower() in exts]
-    out.sort(key=lambda x: x.as_posix().casefold())
-    return out
+def _is_ignored_file(name: str) -> bool:
+    return name in IGNORE_FILES or name.startswith(".")
 
 
-def collect_resource_files(project_root: Path) -> List[Path]:
-    out = [p for p in iter_project_files(project_root) if p.suffix.lower() in RESOURCE_EXTS]
-    out.sort(key=lambda x: x.as_posix().casefold())
-    return out
+def _name_suffix_lower(name: str) -> str:
+    # Same semantics as Path(name).suffix.lower(), without building a Path.
+    i = name.rfind(".")
+    return name[i:].lower() if i > 0 else ""
+
+
+def _scandir_recursive(root: Path) -> Iterable[os.DirEntry]:
+    """Yield file DirEntry objects under root, pruning ignored dirs before descent.
+
+    DirEntry caches is_file()/is_dir() from the directory read, so no extra
+    stat calls are issued per entry (unlike os.walk).
+    """
+    stack: List[str] = [str(root)]
+    while stack:
+        cur = stack.pop()
+        try:
+            it = os.scandir(cur)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune before descending so ignored trees (.godot,
+                    # .import, ...) never get their own scandir call.
+                    if not _is_ignored_dir(name):
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    if not _is_ignored_file(name):
+                        yield entry
+
+
+# Every extension any category cares about, precomputed for the single walk.
+_COLLECT_EXTS = frozenset(RESOURCE_EXTS | SCENE_EXTS | SCRIPT_EXTS | TEXT_RESOURCE_EXTS)
+
+
+def collect_all(project_root: Path) -> Tuple[Dict[str, List[Path]], Set[str]]:
+    """One traversal feeding every file category the report needs.
+
+    Returns ({"scenes": [...], "scripts": [...], "tres": [...], "resources": [...]},
+    all_resources_set) where the set holds res:// paths for the unused check.
+    """
+    buckets: Dict[str, List[Path]] = {"scenes": [], "scripts": [], "tres": [], "resources": []}
+    all_resources: Set[str] = set()
+
+    for e in _scandir_recursive(project_root):
+        ext = _name_suffix_lower(e.name)
+        if ext not in _COLLECT_EXTS:
+            continue
+        p = Path(e.path)
+        if ext in SCENE_EXTS:
+            buckets["scenes"].append(p)
+        elif ext in SCRIPT_EXTS:
+            buckets["scripts"].append(p)
+        elif ext in TEXT_RESOURCE_EXTS:
+            buckets["tres"].append(p)
+        if ext in RESOURCE_EXTS:
+            buckets["resources"].append(p)
+            try:
+                all_resources.add(to_res_path(project_root, p))
+            except Exception:
+                pass
+
+    for name, out in buckets.items():
+        decorated = [(p.as_posix().casefold(), p) for p in out]
+        decorated.sort()
+        buckets[name] = [p for _, p in decorated]
+    return buckets, all_resources
 
 
 # -------------------------
 # File tree
 # -------------------------
-def build_file_tree(project_root: Path) -> str:
-    lines: List[str] = ["res://"]
+def build_file_tree(project_root: Path, write: Callable[[str], None]) -> None:
+    write("res://\n")
 
-    def walk(cur: Path, indent: int) -> None:
+    def walk(cur: str, indent: int) -> None:
         try:
-            entries = list(cur.iterdir())
-        except PermissionError:
+            it = os.scandir(cur)
+        except OSError:
             return
-
-        dirs = sorted(
-            [e for e in entries if e.is_dir() and e.name not in IGNORE_DIRS and not e.name.startswith(".")],
-            key=lambda x: x.name.casefold(),
-        )
-        files = sorted(
-            [e for e in entries if e.is_file() and e.name not in IGNORE_FILES and not e.name.startswith(".")],
-            key=lambda x: x.name.casefold(),
-        )
-
-        pad = "  " * indent
-        for d in dirs:
-            lines.append(f"{pad}{d.name}/")
-            walk(d, indent + 1)
-        for f in files:
-            lines.append(f"{pad}{f.name}")
-
-    walk(project_root, 1)
-    return "\n".join(lines)
+        with it:
+            entries = list(it)
+
+        # Decorated tuples; the plain name breaks casefold ties deterministically.
+        # One pass over the entries (one type check each) instead of two
+        # filtering comprehensions.
+        dirs: List[Tuple[str, str, os.DirEntry]] = []
+        files: List[Tuple[str, str, os.DirEntry]] = []
+        for e in entries:
+            name = e.name
+            if e.is_dir(follow_symlinks=False):
+                if not _is_ignored_dir(name):
+                    dirs.append((name.casefold(), name, e))
+            elif e.is_file(follow_symlinks=False):
+                if not _is_ignored_file(name):
+                    files.append((name.casefold(), name, e))
+        dirs.sort()
+        files.sort()
+
+        pad = _pad(indent)
+        for _, name, d in dirs:
+            write(f"{pad}{name}/\n")
+            walk(d.path, indent + 1)
+        for _, name, _f in files:
+            write(f"{pad}{name}\n")
+
+    walk(str(project_root), 1)
 
 
 # -------------------------
@@ -421,7 +623,9 @@ def parse_tscn(project_root: Path, scene_path: Path) -> SceneParseResult:
         if not line or line.startswith(";"):
             continue
 
-        m = HEADING_RE.match(line)
+        # Property lines vastly outnumber headings; only lines starting with
+        # '[' are worth a heading match at all.
+        m = HEADING_RE.match(line) if line[0] == "[" else None
         if m:
             kind = m.group(1)
             hdr = m.group(2) or ""
@@ -456,9 +660,12 @@ def parse_tscn(project_root: Path, scene_path: Path) -> SceneParseResult:
             flush_node()
             continue
 
-        if cur_node_props is not None and "=" in line:
-            k, v = line.split("=", 1)
-            cur_node_props[k.strip()] = v.strip()
+        if cur_node_props is not None:
+            # line is already stripped, so only the inner edges need trimming;
+            # find+slice avoids the 2-element list split() would allocate.
+            idx = line.find("=")
+            if idx > 0:
+                cur_node_props[line[:idx].rstrip()] = line[idx + 1 :].lstrip()
 
     flush_node()
 
@@ -470,15 +677,14 @@ def parse_tscn(project_root: Path, scene_path: Path) -> SceneParseResult:
         rid: normalize_res_like_path(p, base_dir, project_root) for rid, p in ext_id_to_path.items()
     }
 
-    root_hdr, _, root_order = nodes[0]
-    root_name = root_hdr.get("name", "<ROOT>")
-    root_type = root_hdr.get("type", "Node")
-    root = SceneNode(name=root_name, type_name=root_type, parent_full=None, order=root_order)
-
-    path_to_node: Dict[str, SceneNode] = {root_name: root}
+    root_name = nodes[0][0].get("name", "<ROOT>")
+    root: Optional[SceneNode] = None
+    path_to_node: Dict[str, SceneNode] = {}
 
+    # Every SceneNode is built exactly once, in document order; the root is
+    # simply the idx-0 iteration rather than a pre-created special case.
     for (hdr, props, idx) in nodes:
-        name = hdr.get("name", f"<unnamed_{idx}>")
+        name = hdr.get("name", "<ROOT>" if idx == 0 else f"<unnamed_{idx}>")
         parent_raw = hdr.get("parent")
         instance_raw = hdr.get("instance")
 
@@ -501,63 +707,53 @@ def parse_tscn(project_root: Path, scene_path: Path) -> SceneParseResult:
         if "script" in props:
             script_path = parse_script_value(props["script"], ext_id_to_path_norm, base_dir, project_root)
 
-        n = path_to_node.get(full_path)
-        if n is None:
-            path_to_node[full_path] = SceneNode(
-                name=name,
-                type_name=type_name,
-                parent_full=parent_full,
-                order=idx,
-                script_path=script_path,
-                instance_path=instance_path,
-            )
-        else:
-            n.name = name
-            n.type_name = type_name
-            n.parent_full = parent_full
-            n.order = idx
-            n.script_path = script_path
-            n.instance_path = instance_path
-
-    for full_path, n in list(path_to_node.items()):
-        if n is root:
-            continue
-        if not n.parent_full:
-            warnings.append(f"Node has no parent: {full_path}")
-            continue
-        parent = path_to_node.get(n.parent_full)
-        if not parent:
-            warnings.append(f"Missing parent '{n.parent_full}' for node: {full_path}")
+        n = SceneNode(
+            name=name,
+            type_name=type_name,
+            parent_full=parent_full,
+            order=idx,
+            script_path=script_path,
+            instance_path=instance_path,
+        )
+        path_to_node[full_path] = n
+
+        if idx == 0:
+            root = n
             continue
-        parent.children.append(n)
 
-    for n in path_to_node.values():
-        n.children.sort(key=lambda c: c.order)
+        # .tscn declares parents before children, so the parent is already built.
+        parent = path_to_node.get(parent_full)
+        if parent is None:
+            warnings.append(f"Missing parent '{parent_full}' for node: {full_path}")
+        else:
+            parent.children.append(n)
+
+    if __debug__:
+        # Children are appended in document order, which is the .order field;
+        # guard that invariant rather than re-sorting every list.
+        for n in path_to_node.values():
+            assert all(a.order <= b.order for a, b in zip(n.children, n.children[1:]))
 
     references: Set[str] = set(ext_id_to_path_norm.values())
-    references |= extract_res_uid_strings(text, base_dir, project_root)
-    for mm in EXTRESOURCE_ID_RE.finditer(text):
-        rid = (mm.group(1) or mm.group(2) or "").strip()
-        if rid and rid in ext_id_to_path_norm:
-            references.add(ext_id_to_path_norm[rid])
+    collect_references(text, base_dir, project_root, references)
 
     return SceneParseResult(scene_path, root, connections, references, warnings)
 
 
-def render_scene_tree(root: SceneNode) -> str:
-    out: List[str] = []
-
-    def walk(n: SceneNode, indent: int) -> None:
-        pad = "  " * indent
+def render_scene_tree(root: SceneNode, write: Callable[[str], None]) -> None:
+    # Explicit stack instead of recursion: no Python frame per node, and deep
+    # UI scenes cannot hit the recursion limit.
+    stack: List[Tuple[SceneNode, int]] = [(root, 0)]
+    while stack:
+        n, indent = stack.pop()
+        pad = _pad(indent)
         sl = n.script_label()
         il = n.instance_label()
         suffix = f" <{il}>" if il else ""
-        out.append(f"{pad}{n.name} ({n.type_name}){suffix}" + (f" [{sl}]" if sl else ""))
-        for c in n.children:
-            walk(c, indent + 1)
-
-    walk(root, 0)
-    return "\n".join(out)
+        write(f"{pad}{n.name} ({n.type_name}){suffix}" + (f" [{sl}]\n" if sl else "\n"))
+        # Push children reversed so they pop in document order.
+        for c in reversed(n.children):
+            stack.append((c, indent + 1))
 
 
 # -------------------------
@@ -581,11 +777,7 @@ def parse_tres_references(project_root: Path, tres_path: Path) -> Set[str]:
                 ext_id_to_path[str(rid)] = normalize_res_like_path(p, base_dir, project_root)
 
     refs: Set[str] = set(ext_id_to_path.values())
-    refs |= extract_res_uid_strings(text, base_dir, project_root)
-    for mm in EXTRESOURCE_ID_RE.finditer(text):
-        rid = (mm.group(1) or mm.group(2) or "").strip()
-        if rid and rid in ext_id_to_path:
-            refs.add(ext_id_to_path[rid])
+    collect_references(text, base_dir, project_root, refs)
     return refs
 
 
@@ -597,6 +789,22 @@ EXTENDS_RE = re.compile(r"^\s*extends\s+([^\s#]+)", re.MULTILINE)
 SIGNAL_DECL_RE = re.compile(r"^\s*signal\s+([A-Za-z_]\w*)\s*(\([^)]*\))?", re.MULTILINE)
 
 VAR_DECL_RE = re.compile(r"^\s*var\s+([A-Za-z_]\w*)\s*(?::\s*([^=]+))?\s*(?:=\s*(.*))?$")
+
+
+def parse_var_decl(s: str) -> Optional[Tuple[str, str, str]]:
+    """(name, type, default) for a 'var ...' declaration, or None."""
+    t = s.lstrip()
+    if t.startswith("var ") and ":" not in t and "=" not in t:
+        # Fast path: a bare `var name` needs no regex.
+        name = t[4:].strip()
+        if name.isidentifier():
+            return name, "", ""
+    m = VAR_DECL_RE.match(s)
+    if m:
+        return m.group(1), (m.group(2) or "").strip(), (m.group(3) or "").strip()
+    return None
+
+
 CONNECT_CALL_RE = re.compile(
     r"""(?x)
     (?P<lhs>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)\s*\.\s*connect\s*\(\s*
@@ -616,6 +824,14 @@ class ExportedVar:
     name: str
     vtype: str
     default: str
+    _deco_joined: Optional[str] = None
+
+    def deco_joined(self) -> str:
+        # Needed once in the aggregate table and once per-script; join lazily
+        # and keep the result.
+        if self._deco_joined is None:
+            self._deco_joined = " | ".join(self.decorators)
+        return self._deco_joined
 
 
 @dataclass
@@ -648,48 +864,37 @@ def parse_gd(project_root: Path, gd_path: Path) -> ScriptParseResult:
     signals: List[Tuple[str, str]] = [(ms.group(1), (ms.group(2) or "").strip()) for ms in SIGNAL_DECL_RE.finditer(text)]
 
     exports: List[ExportedVar] = []
-    pending: List[str] = []
-
-    for raw in text.splitlines():
-        line = raw.rstrip()
-        s = line.strip()
-        if not s or s.startswith("#"):
-            continue
+    # Cheap byte-scan prefilter: most scripts have no exports at all, and the
+    # per-line loop below only exists to find them.
+    if "@export" in text:
+        pending: List[str] = []
+        for raw in text.splitlines():
+            line = raw.rstrip()
+            s = line.strip()
+            if not s or s.startswith("#"):
+                continue
 
-        if s.startswith("@export"):
-            if " var " in f" {s} ":
-                parts = s.split(" var ", 1)
-                deco_only = parts[0].strip()
-                rest = "var " + parts[1].strip()
-                mvar = VAR_DECL_RE.match(rest)
-                if mvar:
-                    exports.append(
-                        ExportedVar(
-                            [deco_only],
-                            mvar.group(1),
-                            (mvar.group(2) or "").strip(),
-                            (mvar.group(3) or "").strip(),
-                        )
-                    )
-                pending.clear()
-            else:
-                pending.append(s)
-            continue
+            if s.startswith("@export"):
+                if " var " in f" {s} ":
+                    parts = s.split(" var ", 1)
+                    deco_only = parts[0].strip()
+                    rest = "var " + parts[1].strip()
+                    decl = parse_var_decl(rest)
+                    if decl:
+                        exports.append(ExportedVar([deco_only], *decl))
+                    pending.clear()
+                else:
+                    pending.append(s)
+                continue
 
-        if pending:
-            mvar = VAR_DECL_RE.match(line)
-            if mvar:
-                exports.append(
-                    ExportedVar(
-                        pending[:],
-                        mvar.group(1),
-                        (mvar.group(2) or "").strip(),
-                        (mvar.group(3) or "").strip(),
-                    )
-                )
+            if pending:
+                decl = parse_var_decl(line)
+                if decl:
+                    exports.append(ExportedVar(pending[:], *decl))
+                # A standalone decorator only applies to the next code line;
+                # anything else (func/class/statements) orphans it, so stop
+                # trying to match every following line.
                 pending.clear()
-            if len(pending) > 8:
-                pending = pending[-2:]
 
     references = extract_res_uid_strings(text, gd_path.parent, project_root)
 
@@ -720,6 +925,10 @@ OBJ_HEAD_RE = re.compile(r"Object\(\s*([A-Za-z_]\w*)\s*,")
 FIELD_INT_RE = re.compile(r'"([^"]+)"\s*:\s*(-?\d+)')
 FIELD_BOOL_RE = re.compile(r'"([^"]+)"\s*:\s*(true|false)')
 FIELD_FLOAT_RE = re.compile(r'"([^"]+)"\s*:\s*(-?\d+(?:\.\d+)?)')
+DEADZONE_RE = re.compile(r'"deadzone"\s*:\s*([0-9.]+)')
+
+
+PAREN_RE = re.compile(r"[()]")
 
 
 def split_object_variants(s: str) -> List[str]:
@@ -730,19 +939,17 @@ def split_object_variants(s: str) -> List[str]:
         if start < 0:
             break
         depth = 0
-        j = start
-        while j < len(s):
-            ch = s[j]
-            if ch == "(":
+        for m in PAREN_RE.finditer(s, start):
+            if m.group() == "(":
                 depth += 1
-            elif ch == ")":
+            else:
                 depth -= 1
                 if depth == 0:
-                    out.append(s[start : j + 1])
-                    i = j + 1
+                    out.append(s[start : m.end()])
+                    i = m.end()
                     break
-            j += 1
         else:
+            # Unbalanced Object( ... with no closing paren; stop scanning.
             break
     return out
 
@@ -808,7 +1015,7 @@ def parse_input_map_variants(input_map: Dict[str, str]) -> Dict[str, Dict[str, o
     out: Dict[str, Dict[str, object]] = {}
     for action, raw in input_map.items():
         dz = None
-        m = re.search(r'"deadzone"\s*:\s*([0-9.]+)', raw)
+        m = DEADZONE_RE.search(raw)
         if m:
             try:
                 dz = float(m.group(1))
@@ -824,28 +1031,260 @@ def parse_input_map_variants(input_map: Dict[str, str]) -> Dict[str, Dict[str, o
 # -------------------------
 # Graph helpers
 # -------------------------
-def build_reverse_index(edges: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
-    rev: Dict[str, Set[str]] = {}
-    for src, tgts in edges.items():
-        for t in tgts:
-            rev.setdefault(t, set()).add(src)
-    return rev
+MERMAID_ID_RE = re.compile(r"[^A-Za-z0-9_]")
 
 
 def sanitize_mermaid_id(s: str) -> str:
-    return "N" + re.sub(r"[^A-Za-z0-9_]", "_", s)
+    return "N" + MERMAID_ID_RE.sub("_", s)
 
 
-def mermaid_graph(edges: List[Tuple[str, str]], title: str) -> str:
-    lines = ["```mermaid", "graph TD", f"%% {title}"]
+def mermaid_graph(write: Callable[[str], None], edges: List[Tuple[str, str]], title: str) -> None:
+    write("```mermaid\ngraph TD\n")
+    write(f"%% {title}\n")
     for a, b in edges:
         ida = sanitize_mermaid_id(a)
         idb = sanitize_mermaid_id(b)
         la = a.replace('"', '\\"')
         lb = b.replace('"', '\\"')
-        lines.append(f'{ida}["{la}"] --> {idb}["{lb}"]')
-    lines.append("```")
-    return "\n".join(lines) + "\n"
+        write(f'{ida}["{la}"] --> {idb}["{lb}"]\n')
+    write("```\n\n")
+
+
+# -------------------------
+# Parallel parsing
+# -------------------------
+# Below this many files the pool startup costs more than it saves.
+PARALLEL_MIN_FILES = 8
+
+
+def _parse_files(fn, project_root: Path, paths: List[Path]) -> list:
+    """Map fn(project_root, path) over paths, forking worker processes for
+    larger batches (the parsers are pure-Python regex work, so threads would
+    not help)."""
+    if len(paths) < PARALLEL_MIN_FILES or (os.cpu_count() or 1) < 2:
+        return [fn(project_root, p) for p in paths]
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(functools.partial(fn, project_root), paths, chunksize=16))
+
+
+# -------------------------
+# Markdown section emitters
+# -------------------------
+# One function per report section keeps generate_report small and lets each
+# section's constants (table headers, fallback lines) be compiled once at
+# import instead of living inside one giant function body.
+
+def _emit_input_map(
+    w: Callable[[str], None],
+    emit: Callable[..., None],
+    input_map: Dict[str, Dict[str, object]],
+    input_map_raw: Dict[str, str],
+) -> None:
+    emit("## 0.1) Input Map (project.godot)\n")
+    if not input_map:
+        emit("(No [input] section found.)\n")
+        return
+
+    def _input_row(action: str) -> str:
+        dz = input_map[action]["deadzone"]
+        evs = input_map[action]["events"]
+        ev_text = "<br>".join(evs) if evs else "(no events parsed)"
+        return f"| `{action}` | `{dz if dz is not None else ''}` | {ev_text} |"
+
+    emit("| action | deadzone | events |")
+    emit("|---|---:|---|")
+    emit("\n".join(_input_row(a) for a in sorted_casefold(input_map.keys())))
+    emit("")
+    emit("<details><summary>Raw Input Map (verbatim)</summary>\n")
+    raw_buf = io.StringIO()
+    for action in sorted_casefold(input_map_raw.keys()):
+        raw_buf.write(f"{action}={input_map_raw[action]}\n")
+    write_fenced(w, raw_buf.getvalue().rstrip("\n"))
+    emit("</details>\n")
+
+
+def _emit_scene_sections(
+    w: Callable[[str], None],
+    emit: Callable[..., None],
+    project_root: Path,
+    scene_results: List[SceneParseResult],
+) -> None:
+    emit("## 2) Scene Node Trees (with attached scripts)\n")
+    for r in scene_results:
+        scene_res = to_res_path(project_root, r.scene_path)
+        emit(f"### <Scene> {r.scene_path.name}\n")
+        emit(f"`{scene_res}`\n")
+
+        if not r.root:
+            emit("> Failed to parse this scene.\n")
+            for warning in r.warnings:
+                emit(f"> - {warning}")
+            emit("")
+            continue
+
+        tree_buf = io.StringIO()
+        render_scene_tree(r.root, tree_buf.write)
+        write_fenced(w, tree_buf.getvalue().rstrip("\n"))
+
+        if r.connections:
+            emit("**Persisted Signal Connections** (`[connection ...]` in .tscn)\n")
+            emit("| from | signal | to | method |")
+            emit("|---|---|---|---|")
+            emit("\n".join(f"| `{c.from_path}` | `{c.signal}` | `{c.to_path}` | `{c.method}` |" for c in r.connections))
+            emit("")
+
+        if r.warnings:
+            emit("> Warnings:")
+            for warning in r.warnings:
+                emit(f"> - {warning}")
+            emit("")
+
+
+def _emit_class_registry(emit: Callable[..., None], class_registry: List[Tuple[str, str, str]]) -> None:
+    emit("## 3) Script Registry (class_name / extends)\n")
+    if not class_registry:
+        emit("(No `class_name` found.)\n")
+        return
+    emit("| class_name | script | extends |")
+    emit("|---|---|---|")
+    emit(
+        "\n".join(
+            f"| `{cn}` | `{sp}` | `{ex}` |"
+            for cn, sp, ex in sorted_rows_casefold(class_registry)
+        )
+    )
+    emit("")
+
+
+def _emit_exports(emit: Callable[..., None], exported_rows: List[Tuple[str, str, str, str]]) -> None:
+    emit("## 4) Exported Variables (@export*)\n")
+    if not exported_rows:
+        emit("(No `@export` variables found.)\n")
+        return
+    emit("| script | var | type | decorators |")
+    emit("|---|---|---|---|")
+    emit(
+        "\n".join(
+            f"| `{sp}` | `{name}` | `{vtype}` | `{deco}` |"
+            for sp, name, vtype, deco in sorted_rows_casefold(exported_rows, keys=2)
+        )
+    )
+    emit("")
+
+
+def _emit_signal_mapping(
+    emit: Callable[..., None],
+    all_connections: List[Tuple[str, SceneConnection]],
+    declared_signal_rows: List[Tuple[str, str, str]],
+    script_results: List[ScriptParseResult],
+) -> None:
+    emit("## 5) Signal Mapping\n")
+    emit("### 5.1 Persisted scene connections (.tscn `[connection ...]`)\n")
+    if all_connections:
+        emit("| scene | from | signal | to | method |")
+        emit("|---|---|---|---|---|")
+        emit(
+            "\n".join(
+                f"| `{scene_res}` | `{c.from_path}` | `{c.signal}` | `{c.to_path}` | `{c.method}` |"
+                for scene_res, c in all_connections
+            )
+        )
+        emit("")
+    else:
+        emit("(No persisted `.tscn` connections found.)\n")
+
+    emit("### 5.2 Declared signals in scripts (`signal ...`)\n")
+    if declared_signal_rows:
+        emit("| script | signal | params |")
+        emit("|---|---|---|")
+        emit(
+            "\n".join(
+                f"| `{sp}` | `{sig}` | `{params}` |"
+                for sp, sig, params in sorted_rows_casefold(declared_signal_rows, keys=2)
+            )
+        )
+        emit("")
+    else:
+        emit("(No `signal` declarations found.)\n")
+
+    emit("### 5.3 Potential code-based `connect()` calls (heuristic)\n")
+    any_connect = False
+    for sr in script_results:
+        if sr.connect_calls:
+            any_connect = True
+            emit(f"- `{sr.res_path}`")
+            for lhs, sig in sr.connect_calls[:80]:
+                emit(f"  - `{lhs}.connect({sig})`")
+    if not any_connect:
+        emit("(No `connect()` patterns detected.)\n")
+    emit("")
+
+
+def _emit_usage_map(
+    w: Callable[[str], None], emit: Callable[..., None], usage_map: Dict[str, Tuple[str, ...]]
+) -> None:
+    emit("## 7) Resource Usage Mapping (reverse index)\n")
+    emit("> `target` ← referenced by `sources` (best-effort)\n")
+    if not usage_map:
+        emit("(No resource usage edges detected.)\n")
+        return
+    emit("<details><summary>Show usage map</summary>\n")
+    usage_buf = io.StringIO()
+    for tgt in sorted_casefold(usage_map.keys()):
+        usage_buf.write(tgt)
+        usage_buf.write("\n")
+        for src in usage_map[tgt]:
+            usage_buf.write(f"  <- {src}\n")
+        usage_buf.write("\n")
+    write_fenced(w, usage_buf.getvalue().rstrip())
+    emit("</details>\n")
+
+
+def _emit_unused(w: Callable[[str], None], emit: Callable[..., None], unused: List[str]) -> None:
+    emit("## 8) Unused Resources (best-effort)\n")
+    emit("> Unused = not referenced by parsed scenes/scripts/tres, not main scene/autoload, and not in editor auto/recent references.\n")
+    if not unused:
+        emit("(No unused resources detected by current heuristics.)\n")
+        return
+    emit(f"- Unused count: **{len(unused)}**\n")
+    by_ext: Dict[str, List[str]] = defaultdict(list)
+    for r in unused:
+        slash = r.rfind("/")
+        dot = r.rfind(".", slash + 1)
+        ext = r[dot:].lower() if dot > slash else "(no_ext)"
+        by_ext[ext].append(r)
+
+    for ext in sorted_casefold(by_ext.keys()):
+        emit(f"### {ext}\n")
+        write_fenced(w, "\n".join(by_ext[ext]))
+
+
+def _emit_script_details(
+    w: Callable[[str], None], emit: Callable[..., None], script_results: List[ScriptParseResult]
+) -> None:
+    emit("## 9) Scripts (details)\n")
+    for sr in script_results:
+        emit(f"### <Script> {sr.script_path.name}\n")
+        emit(f"`{sr.res_path}`\n")
+        emit(f"- class_name: `{sr.class_name or ''}`")
+        emit(f"- extends: `{sr.extends or ''}`")
+        emit(f"- referenced resources (strings): {len(sr.references)}")
+        emit(f"- exported vars: {len(sr.exports)}")
+        emit(f"- declared signals: {len(sr.signals)}\n")
+
+        if sr.exports:
+            emit("| var | type | default | decorators |")
+            emit("|---|---|---|---|")
+            emit(
+                "\n".join(
+                    f"| `{ev.name}` | `{ev.vtype}` | `{ev.default}` | `{ev.deco_joined()}` |"
+                    for ev in sr.exports
+                )
+            )
+            emit("")
+
+        if INCLUDE_SCRIPT_CONTENTS:
+            write_fenced(w, sr.content, "gdscript")
 
 
 # -------------------------
@@ -861,51 +1300,62 @@ def generate_report(project_root: Path, output_md: Path) -> None:
     input_map = parse_input_map_variants(input_map_raw)
     editor_refs = detect_editor_references(project_root)
 
-    scenes = collect_files(project_root, SCENE_EXTS)
-    scripts = collect_files(project_root, SCRIPT_EXTS)
-    tres_files = collect_files(project_root, TEXT_RESOURCE_EXTS)
-    resource_files = collect_resource_files(project_root)
+    buckets, all_resources_set = collect_all(project_root)
+    scenes = buckets["scenes"]
+    scripts = buckets["scripts"]
+    tres_files = buckets["tres"]
+    resource_files = buckets["resources"]
 
-    scene_results = [parse_tscn(project_root, sp) for sp in scenes]
-    script_results = [parse_gd(project_root, gp) for gp in scripts]
+    scene_results = _parse_files(parse_tscn, project_root, scenes)
+    script_results = _parse_files(parse_gd, project_root, scripts)
 
     # .tres references
-    tres_refs: Dict[str, Set[str]] = {}
-    for tp in tres_files:
-        tres_refs[to_res_path(project_root, tp)] = parse_tres_references(project_root, tp)
+    tres_refs: Dict[str, Set[str]] = {
+        to_res_path(project_root, tp): refs
+        for tp, refs in zip(tres_files, _parse_files(parse_tres_references, project_root, tres_files))
+    }
 
-    # Build edges: source -> targets
+    # Build edges (source -> targets) and the reverse index in one go, so no
+    # second full traversal over the graph is needed later.
     edges: Dict[str, Set[str]] = {}
+    used_by: Dict[str, Set[str]] = defaultdict(set)
+
+    def add_edge_targets(src: str, tgts: Set[str]) -> None:
+        edges.setdefault(src, set()).update(tgts)
+        for t in tgts:
+            used_by[t].add(src)
 
+    # Results may come back from worker processes with fresh string objects;
+    # intern here so graph keys/members share one object per unique path.
     for r in scene_results:
         src = to_res_path(project_root, r.scene_path)
-        edges[src] = set(r.references)
+        tgts = {intern_path(t) for t in r.references}
         if r.root:
             stack = [r.root]
             while stack:
                 n = stack.pop()
                 if n.script_path and n.script_path.startswith("res://"):
-                    edges[src].add(n.script_path)
+                    tgts.add(intern_path(n.script_path))
                 if n.instance_path and n.instance_path.startswith("res://"):
-                    edges[src].add(n.instance_path)
+                    tgts.add(intern_path(n.instance_path))
                 stack.extend(n.children)
+        add_edge_targets(src, tgts)
 
     for sr in script_results:
-        edges[sr.res_path] = set(sr.references)
+        add_edge_targets(intern_path(sr.res_path), {intern_path(t) for t in sr.references})
 
     for src, refs in tres_refs.items():
-        edges[src] = set(refs)
+        add_edge_targets(src, {intern_path(t) for t in refs})
 
     # project roots
     project_src = "project://project.godot"
     edges.setdefault(project_src, set())
     roots: Set[str] = set()
     if main_scene:
-        edges[project_src].add(main_scene)
         roots.add(main_scene)
-    for a in autoloads:
-        edges[project_src].add(a)
-        roots.add(a)
+    roots.update(autoloads)
+    if roots:
+        add_edge_targets(project_src, set(roots))
 
     # editor refs are only used to exclude from unused list
     auto_ignore_from_unused = set(editor_refs)
@@ -915,40 +1365,32 @@ def generate_report(project_root: Path, output_md: Path) -> None:
     class_to_script: Dict[str, str] = {}
     for sr in script_results:
         if sr.class_name:
-            class_to_script[sr.class_name] = sr.res_path
+            class_to_script[sr.class_name] = intern_path(sr.res_path)
             class_registry.append((sr.class_name, sr.res_path, sr.extends or ""))
 
     if class_to_script:
-        compiled = {cn: re.compile(rf"\b{re.escape(cn)}\b") for cn in class_to_script}
+        # One alternation, one scan per script, instead of one full-text
+        # search per (script, class_name) pair.
+        class_use_re = re.compile(r"\b(" + "|".join(re.escape(cn) for cn in class_to_script) + r")\b")
         for sr in script_results:
-            for cn, cre in compiled.items():
-                if cn == sr.class_name:
-                    continue
-                if cre.search(sr.content):
-                    edges.setdefault(sr.res_path, set()).add(class_to_script[cn])
-
-    used_by = build_reverse_index(edges)
+            found = {m.group(1) for m in class_use_re.finditer(sr.content)}
+            found.discard(sr.class_name)
+            if found:
+                add_edge_targets(intern_path(sr.res_path), {class_to_script[cn] for cn in found})
 
     # Unused resources (best-effort)
-    all_resources_set: Set[str] = set()
-    for p in resource_files:
-        try:
-            all_resources_set.add(to_res_path(project_root, p))
-        except Exception:
-            continue
-
     used_set: Set[str] = set(used_by.keys()) | roots
 
-    unused = sorted(
-        [r for r in all_resources_set if (r not in used_set) and (r not in auto_ignore_from_unused)],
-        key=lambda x: x.casefold(),
+    unused = sorted_casefold(
+        r for r in all_resources_set if (r not in used_set) and (r not in auto_ignore_from_unused)
     )
 
-    # Resource usage map (reverse)
-    usage_map: Dict[str, List[str]] = {}
+    # Resource usage map (reverse); values are sorted once here and stored as
+    # tuples so emission just iterates.
+    usage_map: Dict[str, Tuple[str, ...]] = {}
     for tgt, srcs in used_by.items():
         if tgt.startswith("res://") and tgt in all_resources_set:
-            usage_map[tgt] = sorted(srcs, key=lambda x: x.casefold())
+            usage_map[tgt] = tuple(sorted_casefold(srcs))
 
     # Script dependency edges (Mermaid)
     script_to_script_edges: List[Tuple[str, str]] = []
@@ -957,7 +1399,9 @@ def generate_report(project_root: Path, output_md: Path) -> None:
             for t in tgts:
                 if isinstance(t, str) and t.startswith("res://") and t.endswith(".gd"):
                     script_to_script_edges.append((src, t))
-    script_to_script_edges = sorted(set(script_to_script_edges), key=lambda x: (x[0].casefold(), x[1].casefold()))
+    decorated_edges = [(a.casefold(), b.casefold(), (a, b)) for a, b in set(script_to_script_edges)]
+    decorated_edges.sort()
+    script_to_script_edges = [e for _, _, e in decorated_edges]
 
     # Scene persisted connections
     all_connections: List[Tuple[str, SceneConnection]] = []
@@ -970,7 +1414,7 @@ def generate_report(project_root: Path, output_md: Path) -> None:
     exported_rows: List[Tuple[str, str, str, str]] = []
     for sr in script_results:
         for ev in sr.exports:
-            exported_rows.append((sr.res_path, ev.name, ev.vtype, " | ".join(ev.decorators)))
+            exported_rows.append((sr.res_path, ev.name, ev.vtype, ev.deco_joined()))
 
     # Declared signals aggregated
     declared_signal_rows: List[Tuple[str, str, str]] = []
@@ -979,196 +1423,63 @@ def generate_report(project_root: Path, output_md: Path) -> None:
             declared_signal_rows.append((sr.res_path, sig, params))
 
     # -------------------------
-    # Markdown
+    # Markdown (streamed to disk, one section at a time)
     # -------------------------
-    md: List[str] = []
-    md.append("# Godot Project Context Report\n")
-    md.append(f"- Generated at: {now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    md.append(f"- Project root (as res://): `{project_root.as_posix()}`")
-    md.append(f"- Scenes: {len(scenes)}")
-    md.append(f"- Scripts: {len(scripts)}")
-    md.append(f"- Text Resources (.tres): {len(tres_files)}")
-    md.append(f"- Resource files (for unused check): {len(resource_files)}\n")
-
-    md.append("## 0) Project Settings\n")
-    md.append(f"- Main scene: `{main_scene or ''}`")
-    if autoloads:
-        md.append("- Autoloads:")
-        for a in autoloads:
-            md.append(f"  - `{a}`")
-    else:
-        md.append("- Autoloads: (none detected)")
-    if auto_ignore_from_unused:
-        md.append(f"- Editor auto/recent references (excluded from Unused): {len(auto_ignore_from_unused)}")
-    md.append("")
-
-    md.append("## 0.1) Input Map (project.godot)\n")
-    if input_map:
-        md.append("| action | deadzone | events |")
-        md.append("|---|---:|---|")
-        for action in sorted(input_map.keys(), key=lambda x: x.casefold()):
-            dz = input_map[action]["deadzone"]
-            evs = input_map[action]["events"]
-            ev_text = "<br>".join(evs) if evs else "(no events parsed)"
-            md.append(f"| `{action}` | `{dz if dz is not None else ''}` | {ev_text} |")
-        md.append("")
-        md.append("<details><summary>Raw Input Map (verbatim)</summary>\n")
-        raw_lines = []
-        for action in sorted(input_map_raw.keys(), key=lambda x: x.casefold()):
-            raw_lines.append(f"{action}={input_map_raw[action]}")
-        md.append(fenced("\n".join(raw_lines), "text"))
-        md.append("</details>\n")
-    else:
-        md.append("(No [input] section found.)\n")
-
-    md.append("## 1) File Tree (res://)\n")
-    md.append(fenced(build_file_tree(project_root), "text"))
-
-    md.append("## 2) Scene Node Trees (with attached scripts)\n")
-    for r in scene_results:
-        scene_res = to_res_path(project_root, r.scene_path)
-        md.append(f"### <Scene> {r.scene_path.name}\n")
-        md.append(f"`{scene_res}`\n")
-
-        if not r.root:
-            md.append("> Failed to parse this scene.\n")
-            for w in r.warnings:
-                md.append(f"> - {w}")
-            md.append("")
-            continue
-
-        md.append(fenced(render_scene_tree(r.root), "text"))
-
-        if r.connections:
-            md.append("**Persisted Signal Connections** (`[connection ...]` in .tscn)\n")
-            md.append("| from | signal | to | method |")
-            md.append("|---|---|---|---|")
-            for c in r.connections:
-                md.append(f"| `{c.from_path}` | `{c.signal}` | `{c.to_path}` | `{c.method}` |")
-            md.append("")
-
-        if r.warnings:
-            md.append("> Warnings:")
-            for w in r.warnings:
-                md.append(f"> - {w}")
-            md.append("")
-
-    md.append("## 3) Script Registry (class_name / extends)\n")
-    if class_registry:
-        md.append("| class_name | script | extends |")
-        md.append("|---|---|---|")
-        for cn, sp, ex in sorted(class_registry, key=lambda x: x[0].casefold()):
-            md.append(f"| `{cn}` | `{sp}` | `{ex}` |")
-        md.append("")
-    else:
-        md.append("(No `class_name` found.)\n")
-
-    md.append("## 4) Exported Variables (@export*)\n")
-    if exported_rows:
-        md.append("| script | var | type | decorators |")
-        md.append("|---|---|---|---|")
-        for sp, name, vtype, deco in sorted(exported_rows, key=lambda x: (x[0].casefold(), x[1].casefold())):
-            md.append(f"| `{sp}` | `{name}` | `{vtype}` | `{deco}` |")
-        md.append("")
-    else:
-        md.append("(No `@export` variables found.)\n")
-
-    md.append("## 5) Signal Mapping\n")
-    md.append("### 5.1 Persisted scene connections (.tscn `[connection ...]`)\n")
-    if all_connections:
-        md.append("| scene | from | signal | to | method |")
-        md.append("|---|---|---|---|---|")
-        for scene_res, c in all_connections:
-            md.append(f"| `{scene_res}` | `{c.from_path}` | `{c.signal}` | `{c.to_path}` | `{c.method}` |")
-        md.append("")
-    else:
-        md.append("(No persisted `.tscn` connections found.)\n")
-
-    md.append("### 5.2 Declared signals in scripts (`signal ...`)\n")
-    if declared_signal_rows:
-        md.append("| script | signal | params |")
-        md.append("|---|---|---|")
-        for sp, sig, params in sorted(declared_signal_rows, key=lambda x: (x[0].casefold(), x[1].casefold())):
-            md.append(f"| `{sp}` | `{sig}` | `{params}` |")
-        md.append("")
-    else:
-        md.append("(No `signal` declarations found.)\n")
-
-    md.append("### 5.3 Potential code-based `connect()` calls (heuristic)\n")
-    any_connect = False
-    for sr in script_results:
-        if sr.connect_calls:
-            any_connect = True
-            md.append(f"- `{sr.res_path}`")
-            for lhs, sig in sr.connect_calls[:80]:
-                md.append(f"  - `{lhs}.connect({sig})`")
-    if not any_connect:
-        md.append("(No `connect()` patterns detected.)\n")
-    md.append("")
-
-    md.append("## 6) Script Dependency Graph (best-effort)\n")
-    if script_to_script_edges:
-        md.append(mermaid_graph(script_to_script_edges, "Script → Script dependencies"))
-    else:
-        md.append("(No script→script edges detected.)\n")
-
-    md.append("## 7) Resource Usage Mapping (reverse index)\n")
-    md.append("> `target` ← referenced by `sources` (best-effort)\n")
-    if usage_map:
-        md.append("<details><summary>Show usage map</summary>\n")
-        lines: List[str] = []
-        for tgt in sorted(usage_map.keys(), key=lambda x: x.casefold()):
-            lines.append(tgt)
-            for src in usage_map[tgt]:
-                lines.append(f"  <- {src}")
-            lines.append("")
-        md.append(fenced("\n".join(lines).rstrip(), "text"))
-        md.append("</details>\n")
-    else:
-        md.append("(No resource usage edges detected.)\n")
-
-    md.append("## 8) Unused Resources (best-effort)\n")
-    md.append("> Unused = not referenced by parsed scenes/scripts/tres, not main scene/autoload, and not in editor auto/recent references.\n")
-    if unused:
-        md.append(f"- Unused count: **{len(unused)}**\n")
-        by_ext: Dict[str, List[str]] = {}
-        for r in unused:
-            ext = Path(r.replace("res://", "").replace("res:///", "")).suffix.lower()
-            by_ext.setdefault(ext or "(no_ext)", []).append(r)
-
-        for ext in sorted(by_ext.keys(), key=lambda x: x.casefold()):
-            md.append(f"### {ext}\n")
-            md.append(fenced("\n".join(by_ext[ext]), "text"))
-    else:
-        md.append("(No unused resources detected by current heuristics.)\n")
-
-    md.append("## 9) Scripts (details)\n")
-    for sr in script_results:
-        md.append(f"### <Script> {sr.script_path.name}\n")
-        md.append(f"`{sr.res_path}`\n")
-        md.append(f"- class_name: `{sr.class_name or ''}`")
-        md.append(f"- extends: `{sr.extends or ''}`")
-        md.append(f"- referenced resources (strings): {len(sr.references)}")
-        md.append(f"- exported vars: {len(sr.exports)}")
-        md.append(f"- declared signals: {len(sr.signals)}\n")
-
-        if sr.exports:
-            md.append("| var | type | default | decorators |")
-            md.append("|---|---|---|---|")
-            for ev in sr.exports:
-                md.append(f"| `{ev.name}` | `{ev.vtype}` | `{ev.default}` | `{ ' | '.join(ev.decorators) }` |")
-            md.append("")
+    output_md.parent.mkdir(parents=True, exist_ok=True)
+    with output_md.open("w", encoding="utf-8", newline="\n", buffering=1 << 20) as f:
+        w = f.write
+
+        def emit(line: str = "") -> None:
+            w(line)
+            w("\n")
+
+        emit("# Godot Project Context Report\n")
+        emit(f"- Generated at: {now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+        emit(f"- Project root (as res://): `{project_root.as_posix()}`")
+        emit(f"- Scenes: {len(scenes)}")
+        emit(f"- Scripts: {len(scripts)}")
+        emit(f"- Text Resources (.tres): {len(tres_files)}")
+        emit(f"- Resource files (for unused check): {len(resource_files)}\n")
+
+        emit("## 0) Project Settings\n")
+        emit(f"- Main scene: `{main_scene or ''}`")
+        if autoloads:
+            emit("- Autoloads:")
+            for a in autoloads:
+                emit(f"  - `{a}`")
+        else:
+            emit("- Autoloads: (none detected)")
+        if auto_ignore_from_unused:
+            emit(f"- Editor auto/recent references (excluded from Unused): {len(auto_ignore_from_unused)}")
+        emit("")
+
+        _emit_input_map(w, emit, input_map, input_map_raw)
+
+        emit("## 1) File Tree (res://)\n")
+        tree_buf = io.StringIO()
+        build_file_tree(project_root, tree_buf.write)
+        write_fenced(w, tree_buf.getvalue().rstrip("\n"))
+
+        _emit_scene_sections(w, emit, project_root, scene_results)
+        _emit_class_registry(emit, class_registry)
+        _emit_exports(emit, exported_rows)
+        _emit_signal_mapping(emit, all_connections, declared_signal_rows, script_results)
+
+        emit("## 6) Script Dependency Graph (best-effort)\n")
+        if script_to_script_edges:
+            mermaid_graph(w, script_to_script_edges, "Script → Script dependencies")
+        else:
+            emit("(No script→script edges detected.)\n")
 
-        if INCLUDE_SCRIPT_CONTENTS:
-            md.append(fenced(sr.content, "gdscript"))
+        _emit_usage_map(w, emit, usage_map)
+        _emit_unused(w, emit, unused)
+        _emit_script_details(w, emit, script_results)
 
-    md.append("## 10) Caveats (static analysis limits)\n")
-    md.append("- Dynamic loads (constructed paths, runtime resources) may not be detected.")
-    md.append("- `uid://...` references are preserved but not resolved to filesystem paths here.")
-    md.append("- Editor metadata files may contain personal/temporary paths; they are only used to avoid false 'unused' reports.\n")
+        emit("## 10) Caveats (static analysis limits)\n")
+        emit("- Dynamic loads (constructed paths, runtime resources) may not be detected.")
+        emit("- `uid://...` references are preserved but not resolved to filesystem paths here.")
+        emit("- Editor metadata files may contain personal/temporary paths; they are only used to avoid false 'unused' reports.\n")
 
-    output_md.parent.mkdir(parents=True, exist_ok=True)
-    output_md.write_text("\n".join(md).replace("\r\n", "\n"), encoding="utf-8")
 
 
 if __name__ == "__main__":